@@ -1,74 +1,264 @@
-import json
+import asyncio
+import functools
+import logging
 import os
-from datetime import datetime
+import time
+from collections.abc import Awaitable, Callable
+import aiofiles
+import orjson
+from datetime import datetime, timezone
 from pathlib import Path
-from fastapi import APIRouter, HTTPException
-from app.schemas.automation import AutomationScript, AutomationStep, ExecutionLog
-from app.services.terminal_service import terminal_manager
-from app.core.config import settings
+from typing import Any
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import ValidationError
+from watchfiles import awatch
+from app.schemas.automation import ActionType, AutomationScript, AutomationStep, ExecutionLog
+from app.services.terminal_service import TerminalSession, terminal_manager
+from app.core.config import SCRIPTS_DIR, LOGS_DIR
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
+# Parsed script and index files keyed by path, invalidated by st_mtime_ns
+_SCRIPT_CACHE: dict[Path, tuple[int, Any]] = {}
+# Set while watch_scripts runs; cached entries are then trusted without a stat
+_watching = False
 
-def get_scripts_dir() -> Path:
-    """Get scripts directory path"""
-    scripts_dir = Path(settings.scripts_dir)
-    scripts_dir.mkdir(parents=True, exist_ok=True)
-    return scripts_dir
+# Summaries of every script keyed by script id, maintained on write
+INDEX_PATH = SCRIPTS_DIR / "_index.json"
+_INDEX_LOCK = asyncio.Lock()
 
+# Number of buffered execution log records appended to disk at once
+LOG_FLUSH_EVERY = 100
 
-def get_logs_dir() -> Path:
-    """Get logs directory path"""
-    logs_dir = Path(settings.logs_dir)
-    logs_dir.mkdir(parents=True, exist_ok=True)
-    return logs_dir
+
+def _load_cached(path: Path, parse: Callable[[bytes], Any] = orjson.loads) -> Any:
+    """Load and parse a file, reusing the parsed data while its mtime is unchanged"""
+    cached = _SCRIPT_CACHE.get(path)
+    if cached and _watching:
+        # The watcher drops entries whose files change
+        return cached[1]
+
+    mtime = path.stat().st_mtime_ns
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    data = parse(path.read_bytes())
+    _SCRIPT_CACHE[path] = (mtime, data)
+    return data
+
+
+def _script_summary(script: AutomationScript) -> dict:
+    """list_scripts entry for a script model"""
+    return {
+        "id": script.id,
+        "name": script.name,
+        "description": script.description,
+        "host": script.host,
+        "steps_count": len(script.steps)
+    }
+
+
+def _file_summary(path: Path) -> dict | None:
+    """list_scripts entry for a script file
+
+    Files that fail schema validation are projected from the raw JSON so
+    broken scripts stay listed and can be deleted; non-objects give None.
+    """
+    try:
+        return _script_summary(_load_cached(path, AutomationScript.model_validate_json))
+    except ValidationError:
+        pass
+
+    data = orjson.loads(path.read_bytes())
+    if not isinstance(data, dict):
+        return None
+    return {
+        "id": data.get("id"),
+        "name": data.get("name"),
+        "description": data.get("description"),
+        "host": data.get("host"),
+        "steps_count": len(data.get("steps", []))
+    }
+
+
+def _write_index(index: dict[str, dict]):
+    """Replace the index file; not fsynced since it is rebuilt at startup"""
+    tmp_path = INDEX_PATH.with_suffix(".tmp")
+    tmp_path.write_bytes(orjson.dumps(index))
+    os.replace(tmp_path, INDEX_PATH)
+
+
+def rebuild_script_index() -> dict[str, dict]:
+    """Scan the scripts directory once, loading every script into the cache, and rewrite the index"""
+    index = {}
+    seen = set()
+    with os.scandir(SCRIPTS_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json") or entry.path == str(INDEX_PATH):
+                continue
+            try:
+                if entry.is_file():
+                    path = Path(entry.path)
+                    seen.add(path)
+                    summary = _file_summary(path)
+                    if summary is not None:
+                        index[entry.name[:-5]] = summary
+            except Exception:
+                continue
+
+    # Forget files that are gone, and the index about to be replaced
+    for path in [path for path in _SCRIPT_CACHE if path not in seen]:
+        _SCRIPT_CACHE.pop(path, None)
+
+    _write_index(index)
+    return index
+
+
+def _read_index() -> dict[str, dict]:
+    """Load the script index, rebuilding it if it is missing"""
+    try:
+        return _load_cached(INDEX_PATH)
+    except FileNotFoundError:
+        return rebuild_script_index()
+
+
+def _script_path(script_id: str) -> Path:
+    """Path of a script file, rejecting ids that collide with the index"""
+    file_path = SCRIPTS_DIR / f"{script_id}.json"
+    if file_path == INDEX_PATH:
+        raise HTTPException(status_code=400, detail="Invalid script id")
+    return file_path
+
+
+async def _update_index(script_id: str, projection: dict | None):
+    """Set or remove (projection=None) a script's entry in the index"""
+    async with _INDEX_LOCK:
+        index = dict(_read_index())
+        if projection is None:
+            index.pop(script_id, None)
+        else:
+            index[script_id] = projection
+        await asyncio.to_thread(_write_index, index)
+        _SCRIPT_CACHE[INDEX_PATH] = (INDEX_PATH.stat().st_mtime_ns, index)
+
+
+async def _sync_index_entry(path: Path):
+    """Bring the index entry for a script file changed on disk up to date"""
+    script_id = path.stem
+    try:
+        summary = _file_summary(path)
+    except Exception:
+        # Deleted or no longer JSON
+        summary = None
+
+    if _read_index().get(script_id) != summary:
+        await _update_index(script_id, summary)
+
+
+async def watch_scripts(stop_event: asyncio.Event):
+    """Drop cached files as they change on disk and keep the index in sync"""
+    global _watching
+    try:
+        # yield_on_timeout makes the first iteration arrive even without changes
+        async for changes in awatch(SCRIPTS_DIR, stop_event=stop_event, yield_on_timeout=True):
+            if not _watching:
+                # The watcher is registered now, but edits made since the startup
+                # scan were never reported; rescan with mtime checks before
+                # trusting the cache
+                async with _INDEX_LOCK:
+                    await asyncio.to_thread(rebuild_script_index)
+                _watching = True
+                continue
+
+            for _, changed in changes:
+                path = Path(changed)
+                _SCRIPT_CACHE.pop(path, None)
+                if path.suffix == ".json" and path != INDEX_PATH:
+                    await _sync_index_entry(path)
+    finally:
+        _watching = False
+        _SCRIPT_CACHE.clear()
+
+
+@functools.lru_cache(maxsize=1024)
+def _timestamp_prefix(seconds: int) -> str:
+    """ISO timestamp for a whole UTC second"""
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _format_timestamp(ts_ns: int) -> str:
+    """Format a time.time_ns() value like datetime.utcnow().isoformat()"""
+    seconds, ns = divmod(ts_ns, 1_000_000_000)
+    micros = ns // 1000
+    if not micros:
+        return _timestamp_prefix(seconds)
+    return f"{_timestamp_prefix(seconds)}.{micros:06d}"
+
+
+async def _flush_logs(log_path: Path, pending: list[tuple], logs: list[ExecutionLog]):
+    """Resolve buffered log records and append them to the execution log file
+
+    Writing the file is best-effort; a failed append never fails the run.
+    """
+    if not pending:
+        return
+
+    batch = [
+        ExecutionLog(
+            step_id=step_id,
+            status=status,
+            message=message,
+            timestamp=_format_timestamp(ts_ns)
+        )
+        for step_id, status, message, ts_ns in pending
+    ]
+    pending.clear()
+    logs.extend(batch)
+
+    payload = b"".join(
+        orjson.dumps(entry.model_dump(), option=orjson.OPT_APPEND_NEWLINE) for entry in batch
+    )
+    try:
+        async with aiofiles.open(log_path, "ab") as f:
+            await f.write(payload)
+    except OSError as e:
+        logger.warning("Failed to write execution log %s: %s", log_path, e)
 
 
 @router.get("/scripts")
-async def list_scripts():
+async def list_scripts(pretty: bool = False):
     """List all automation scripts"""
-    scripts_dir = get_scripts_dir()
-    scripts = []
-
-    for file_path in scripts_dir.glob("*.json"):
-        try:
-            with open(file_path, "r") as f:
-                script_data = json.load(f)
-                scripts.append({
-                    "id": script_data.get("id"),
-                    "name": script_data.get("name"),
-                    "description": script_data.get("description"),
-                    "host": script_data.get("host"),
-                    "steps_count": len(script_data.get("steps", []))
-                })
-        except Exception:
-            continue
-
-    return {"scripts": scripts}
+    scripts = list(_read_index().values())
+    option = orjson.OPT_INDENT_2 if pretty else None
+    return Response(orjson.dumps({"scripts": scripts}, option=option), media_type="application/json")
 
 
-@router.get("/scripts/{script_id}")
-async def get_script(script_id: str) -> AutomationScript:
-    """Get a specific automation script"""
-    scripts_dir = get_scripts_dir()
-    file_path = scripts_dir / f"{script_id}.json"
-
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Script not found")
+def _load_script(script_id: str) -> AutomationScript:
+    """Load a script from disk"""
+    file_path = _script_path(script_id)
 
     try:
-        with open(file_path, "r") as f:
-            script_data = json.load(f)
-            return AutomationScript(**script_data)
+        # Validated once per file change, then served from the cache
+        return _load_cached(file_path, AutomationScript.model_validate_json)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Script not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load script: {str(e)}")
 
 
+@router.get("/scripts/{script_id}")
+async def get_script(script_id: str, pretty: bool = False):
+    """Get a specific automation script"""
+    script = _load_script(script_id)
+    indent = 2 if pretty else None
+    return Response(script.model_dump_json(indent=indent).encode(), media_type="application/json")
+
+
 @router.post("/scripts")
 async def create_script(script: AutomationScript):
     """Create a new automation script"""
-    scripts_dir = get_scripts_dir()
-    file_path = scripts_dir / f"{script.id}.json"
+    file_path = _script_path(script.id)
 
     if file_path.exists():
         raise HTTPException(status_code=400, detail="Script already exists")
@@ -78,8 +268,11 @@ async def create_script(script: AutomationScript):
         script.created_at = datetime.utcnow().isoformat()
         script.updated_at = script.created_at
 
-        with open(file_path, "w") as f:
-            json.dump(script.model_dump(), f, indent=2)
+        payload = script.model_dump_json().encode()
+        async with aiofiles.open(file_path, "wb") as f:
+            await f.write(payload)
+        _SCRIPT_CACHE.pop(file_path, None)
+        await _update_index(script.id, _script_summary(script))
 
         return {"status": "created", "script_id": script.id}
     except Exception as e:
@@ -89,8 +282,7 @@ async def create_script(script: AutomationScript):
 @router.put("/scripts/{script_id}")
 async def update_script(script_id: str, script: AutomationScript):
     """Update an existing automation script"""
-    scripts_dir = get_scripts_dir()
-    file_path = scripts_dir / f"{script_id}.json"
+    file_path = _script_path(script_id)
 
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="Script not found")
@@ -99,8 +291,11 @@ async def update_script(script_id: str, script: AutomationScript):
         # Update timestamp
         script.updated_at = datetime.utcnow().isoformat()
 
-        with open(file_path, "w") as f:
-            json.dump(script.model_dump(), f, indent=2)
+        payload = script.model_dump_json().encode()
+        async with aiofiles.open(file_path, "wb") as f:
+            await f.write(payload)
+        _SCRIPT_CACHE.pop(file_path, None)
+        await _update_index(script_id, _script_summary(script))
 
         return {"status": "updated", "script_id": script_id}
     except Exception as e:
@@ -110,14 +305,15 @@ async def update_script(script_id: str, script: AutomationScript):
 @router.delete("/scripts/{script_id}")
 async def delete_script(script_id: str):
     """Delete an automation script"""
-    scripts_dir = get_scripts_dir()
-    file_path = scripts_dir / f"{script_id}.json"
+    file_path = _script_path(script_id)
 
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="Script not found")
 
     try:
-        file_path.unlink()
+        await asyncio.to_thread(file_path.unlink)
+        _SCRIPT_CACHE.pop(file_path, None)
+        await _update_index(script_id, None)
         return {"status": "deleted"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete script: {str(e)}")
@@ -127,91 +323,110 @@ async def delete_script(script_id: str):
 async def execute_script(script_id: str):
     """Execute an automation script"""
     # Load script
-    script = await get_script(script_id)
+    script = _load_script(script_id)
 
-    # Create session
-    session_id = terminal_manager.create_session(
-        host=script.host,
-        port=script.port,
-        use_tls=script.use_tls
-    )
-
-    session = terminal_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=500, detail="Failed to create session")
+    # Scripts are recorded against a fresh connection, so only reuse one when asked to
+    pool = script.id if script.reuse_session else None
+    try:
+        session, reused = await terminal_manager.acquire(script.host, script.port, script.use_tls, pool)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    session_id = session.session_id
 
     logs: list[ExecutionLog] = []
+    # (step_id, status, message, time_ns) records waiting to be flushed
+    pending: list[tuple] = []
+    log_path = LOGS_DIR / f"{session_id}.jsonl"
+    failed = False
 
     try:
-        # Connect
-        await session.connect()
-        logs.append(ExecutionLog(
-            step_id="connect",
-            status="success",
-            message=f"Connected to {script.host}:{script.port}",
-            timestamp=datetime.utcnow().isoformat()
-        ))
+        if reused:
+            pending.append(("connect", "success", f"Reused session {session_id} to {script.host}:{script.port}", time.time_ns()))
+        else:
+            pending.append(("connect", "success", f"Connected to {script.host}:{script.port}", time.time_ns()))
 
         # Execute steps
         for step in script.steps:
             try:
                 await execute_step(session, step)
-                logs.append(ExecutionLog(
-                    step_id=step.id,
-                    status="success",
-                    message=f"Executed: {step.action}",
-                    timestamp=datetime.utcnow().isoformat()
-                ))
+                pending.append((step.id, "success", f"Executed: {step.action}", time.time_ns()))
             except Exception as e:
-                logs.append(ExecutionLog(
-                    step_id=step.id,
-                    status="error",
-                    message=str(e),
-                    timestamp=datetime.utcnow().isoformat()
-                ))
+                pending.append((step.id, "error", str(e), time.time_ns()))
+                failed = True
                 break
 
-        return {"status": "completed", "session_id": session_id, "logs": logs}
+            if len(pending) >= LOG_FLUSH_EVERY:
+                await _flush_logs(log_path, pending, logs)
+
+        await _flush_logs(log_path, pending, logs)
 
     except Exception as e:
         await terminal_manager.remove_session(session_id)
         raise HTTPException(status_code=500, detail=str(e))
 
+    # A failed run may have left the session on an error screen, never pool it
+    if pool is None or failed:
+        await terminal_manager.remove_session(session_id)
+    else:
+        await terminal_manager.release(session, pool)
+    return {"status": "completed", "session_id": session_id, "logs": logs}
 
-async def execute_step(session, step: AutomationStep):
-    """Execute a single automation step"""
-    from app.schemas.automation import ActionType
 
-    if step.action == ActionType.SEND_TEXT:
-        if step.row is not None and step.col is not None:
-            await session.send_text(step.text or "", step.row, step.col)
-        else:
-            await session.send_text(step.text or "")
+async def _step_send_text(session: TerminalSession, step: AutomationStep):
+    if step.row is not None and step.col is not None:
+        await session.send_text(step.text or "", step.row, step.col)
+    else:
+        await session.send_text(step.text or "")
+
+
+async def _step_send_key(session: TerminalSession, step: AutomationStep):
+    await session.send_key(step.key or "enter")
+
+
+async def _step_move_cursor(session: TerminalSession, step: AutomationStep):
+    if step.row is not None and step.col is not None:
+        await session.move_cursor(step.row, step.col)
+
 
-    elif step.action == ActionType.SEND_KEY:
-        await session.send_key(step.key or "enter")
+async def _step_wait(session: TerminalSession, step: AutomationStep):
+    await asyncio.sleep(step.timeout or 1.0)
 
-    elif step.action == ActionType.MOVE_CURSOR:
-        if step.row is not None and step.col is not None:
-            await session.move_cursor(step.row, step.col)
 
-    elif step.action == ActionType.WAIT:
-        import asyncio
-        await asyncio.sleep(step.timeout or 1.0)
+async def _step_wait_for_text(session: TerminalSession, step: AutomationStep):
+    success = await session.wait_for_text(step.text or "", step.timeout or 10.0)
+    if not success:
+        raise Exception(f"Timeout waiting for text: {step.text}")
 
-    elif step.action == ActionType.WAIT_FOR_TEXT:
-        success = await session.wait_for_text(step.text or "", step.timeout or 10.0)
-        if not success:
-            raise Exception(f"Timeout waiting for text: {step.text}")
 
-    elif step.action == ActionType.READ_SCREEN:
-        screen_data = await session.get_screen_data()
-        # Could save or return screen data
+async def _step_read_screen(session: TerminalSession, step: AutomationStep):
+    screen_data = await session.get_screen_data()
+    # Could save or return screen data
 
-    elif step.action == ActionType.ASSERT_TEXT:
-        screen_data = await session.get_screen_data()
-        if step.text and step.text not in screen_data.text:
-            raise Exception(f"Assertion failed: '{step.text}' not found on screen")
 
-    elif step.action == ActionType.DISCONNECT:
-        await session.disconnect()
+async def _step_assert_text(session: TerminalSession, step: AutomationStep):
+    screen_data = await session.get_screen_data()
+    if step.text and step.text not in screen_data.text:
+        raise Exception(f"Assertion failed: '{step.text}' not found on screen")
+
+
+async def _step_disconnect(session: TerminalSession, step: AutomationStep):
+    await session.disconnect()
+
+
+_STEP_HANDLERS: dict[ActionType, Callable[[TerminalSession, AutomationStep], Awaitable[None]]] = {
+    ActionType.SEND_TEXT: _step_send_text,
+    ActionType.SEND_KEY: _step_send_key,
+    ActionType.MOVE_CURSOR: _step_move_cursor,
+    ActionType.WAIT: _step_wait,
+    ActionType.WAIT_FOR_TEXT: _step_wait_for_text,
+    ActionType.READ_SCREEN: _step_read_screen,
+    ActionType.ASSERT_TEXT: _step_assert_text,
+    ActionType.DISCONNECT: _step_disconnect,
+}
+
+
+async def execute_step(session: TerminalSession, step: AutomationStep):
+    """Execute a single automation step"""
+    handler = _STEP_HANDLERS.get(step.action)
+    if handler is not None:
+        await handler(session, step)
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException
-from app.schemas.automation import ConnectionRequest, TerminalInput, ScreenData
+import orjson
+from fastapi import APIRouter, HTTPException, Response
+from app.schemas.automation import ConnectionRequest, TerminalInput
 from app.services.terminal_service import terminal_manager
 
 router = APIRouter()
@@ -46,18 +47,22 @@ async def disconnect_terminal(session_id: str):
 @router.get("/sessions")
 async def list_sessions():
     """List all active sessions"""
-    return {"sessions": terminal_manager.list_sessions()}
+    return Response(
+        orjson.dumps({"sessions": terminal_manager.list_sessions()}),
+        media_type="application/json"
+    )
 
 
 @router.get("/screen/{session_id}")
-async def get_screen(session_id: str) -> ScreenData:
+async def get_screen(session_id: str):
     """Get current screen data"""
     session = terminal_manager.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
     try:
-        return await session.get_screen_data()
+        screen_data = await session.get_screen_data()
+        return Response(orjson.dumps(screen_data.model_dump(mode="json")), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
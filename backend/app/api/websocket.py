@@ -1,28 +1,87 @@
 import asyncio
-import json
+from typing import Optional
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from app.schemas.automation import ScreenData
 from app.services.terminal_service import terminal_manager
 
 router = APIRouter()
 
+# Send a full frame instead of a diff once more than this share of rows changed
+FULL_FRAME_RATIO = 0.5
+
 
 class ConnectionManager:
-    """Manage WebSocket connections"""
+    """Manage WebSocket connections and the shared screen stream per session"""
 
     def __init__(self):
-        self.active_connections: dict[str, WebSocket] = {}
+        self.active_connections: dict[str, set[WebSocket]] = {}
+        # One screen polling task per session, shared by all of its subscribers
+        self.streams: dict[str, asyncio.Task] = {}
+        # Last screen sent per session as ((cursor_row, cursor_col), rows)
+        self.last_sent: dict[str, tuple[tuple[int, int], list[str]]] = {}
 
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
-        self.active_connections[session_id] = websocket
-
-    def disconnect(self, session_id: str):
-        if session_id in self.active_connections:
-            del self.active_connections[session_id]
+        self.active_connections.setdefault(session_id, set()).add(websocket)
+        # Forget the last frame so the next tick sends everyone a full screen
+        self.last_sent.pop(session_id, None)
+        # Restart the stream if it ended, e.g. the session didn't exist yet
+        stream = self.streams.get(session_id)
+        if stream is None or stream.done():
+            self.streams[session_id] = asyncio.create_task(send_screen_updates(session_id))
+
+    def disconnect(self, websocket: WebSocket, session_id: str):
+        subscribers = self.active_connections.get(session_id)
+        if subscribers is not None:
+            subscribers.discard(websocket)
+            if subscribers:
+                return
+            self.active_connections.pop(session_id, None)
+
+        # Last subscriber left, stop polling the session
+        stream = self.streams.pop(session_id, None)
+        if stream is not None:
+            stream.cancel()
+        self.last_sent.pop(session_id, None)
+
+    def screen_message(self, session_id: str, screen_data: ScreenData) -> Optional[dict]:
+        """Build the update for a screen relative to the last one sent, or None if unchanged"""
+        cursor = (screen_data.cursor_row, screen_data.cursor_col)
+        rows = screen_data.lines
+        last = self.last_sent.get(session_id)
+        self.last_sent[session_id] = (cursor, rows)
+
+        if last is None or len(last[1]) != len(rows):
+            return {"type": "screen_update", "data": screen_data.model_dump()}
+
+        last_cursor, last_rows = last
+        changed = [i for i, (old, new) in enumerate(zip(last_rows, rows)) if old != new]
+        if not changed and cursor == last_cursor:
+            return None
+        if len(changed) > len(rows) * FULL_FRAME_RATIO:
+            return {"type": "screen_update", "data": screen_data.model_dump()}
+
+        return {
+            "type": "screen_diff",
+            "data": {
+                "cursor_row": cursor[0],
+                "cursor_col": cursor[1],
+                "rows": [{"r": i, "t": rows[i]} for i in changed]
+            }
+        }
 
     async def send_message(self, session_id: str, message: dict):
-        if session_id in self.active_connections:
-            await self.active_connections[session_id].send_json(message)
+        """Encode a message once and send it to every subscriber of a session"""
+        subscribers = self.active_connections.get(session_id)
+        if not subscribers:
+            return
+
+        payload = orjson.dumps(message).decode()
+        await asyncio.gather(
+            *(websocket.send_text(payload) for websocket in list(subscribers)),
+            return_exceptions=True
+        )
 
 
 manager = ConnectionManager()
@@ -34,14 +93,9 @@ async def terminal_websocket(websocket: WebSocket, session_id: str):
     await manager.connect(websocket, session_id)
 
     try:
-        # Start screen update loop
-        update_task = asyncio.create_task(
-            send_screen_updates(websocket, session_id)
-        )
-
         # Listen for commands from client
         while True:
-            data = await websocket.receive_json()
+            data = orjson.loads(await websocket.receive_text())
             command = data.get("command")
 
             if command == "input":
@@ -52,12 +106,11 @@ async def terminal_websocket(websocket: WebSocket, session_id: str):
     except WebSocketDisconnect:
         pass
     finally:
-        update_task.cancel()
-        manager.disconnect(session_id)
+        manager.disconnect(websocket, session_id)
 
 
-async def send_screen_updates(websocket: WebSocket, session_id: str):
-    """Send periodic screen updates to client"""
+async def send_screen_updates(session_id: str):
+    """Send periodic screen updates to every client of a session"""
     session = terminal_manager.get_session(session_id)
     if not session:
         return
@@ -67,12 +120,11 @@ async def send_screen_updates(websocket: WebSocket, session_id: str):
             if session.is_connected:
                 try:
                     screen_data = await session.get_screen_data()
-                    await websocket.send_json({
-                        "type": "screen_update",
-                        "data": screen_data.model_dump()
-                    })
+                    message = manager.screen_message(session_id, screen_data)
+                    if message is not None:
+                        await manager.send_message(session_id, message)
                 except Exception as e:
-                    await websocket.send_json({
+                    await manager.send_message(session_id, {
                         "type": "error",
                         "message": str(e)
                     })
@@ -94,14 +146,11 @@ async def handle_input_command(session_id: str, data: dict):
         row = data.get("row")
         col = data.get("col")
 
-        if row is not None and col is not None:
-            await session.move_cursor(row, col)
-
-        if text:
-            await session.send_text(text)
-
-        if key:
-            await session.send_key(key)
+        # Apply the input and read the resulting screen in one executor call
+        screen_data = await session.send_and_read(text, key, row, col)
+        message = manager.screen_message(session_id, screen_data)
+        if message is not None:
+            await manager.send_message(session_id, message)
 
     except Exception as e:
         # Error will be sent in next screen update
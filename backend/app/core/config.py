@@ -1,3 +1,4 @@
+from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -19,6 +20,9 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = True
+    loop: str = "auto"  # uvicorn picks uvloop when installed, asyncio otherwise
+    http: str = "httptools"
+    thread_pool_size: int = 32  # default executor for to_thread/aiofiles work
 
     # CORS Settings
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000"]
@@ -29,3 +33,7 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
+
+# Resolved once; created at application startup
+SCRIPTS_DIR = Path(settings.scripts_dir).resolve()
+LOGS_DIR = Path(settings.logs_dir).resolve()
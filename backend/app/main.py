@@ -1,13 +1,35 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import settings
+from app.core.config import settings, SCRIPTS_DIR, LOGS_DIR
+from app.core.orjson_response import ORJSONResponse
 from app.api import connections, automation, websocket
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.thread_pool_size)
+    )
+    SCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    automation.rebuild_script_index()
+    stop_watching = asyncio.Event()
+    watcher = asyncio.create_task(automation.watch_scripts(stop_watching))
+    yield
+    stop_watching.set()
+    await watcher
+
+
 app = FastAPI(
     title=settings.api_title,
     version=settings.api_version,
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
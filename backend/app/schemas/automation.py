@@ -46,6 +46,10 @@ class AutomationScript(BaseModel):
     port: int = Field(default=23, description="3270 host port")
     use_tls: bool = Field(default=True, description="Use TLS connection")
     steps: list[AutomationStep] = Field(default_factory=list, description="Automation steps")
+    reuse_session: bool = Field(
+        default=False,
+        description="Run on the connection kept open by this script's previous run instead of connecting fresh"
+    )
     created_at: str | None = None
     updated_at: str | None = None
 
@@ -76,6 +80,7 @@ class ScreenData(BaseModel):
     cursor_col: int
     text: str  # Full screen text
     fields: list[dict[str, Any]] = Field(default_factory=list)  # Input fields info
+    lines: list[str] = Field(default_factory=list, exclude=True)  # Screen rows, not serialized
 
 
 class ExecutionLog(BaseModel):
@@ -1,10 +1,88 @@
-import uuid
 import asyncio
+import functools
+import logging
 import re
-from typing import Optional
-from tnz.py3270 import Emulator
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from tnz.py3270 import Emulator, Output
 from app.schemas.automation import ScreenData
 
+logger = logging.getLogger(__name__)
+
+# Screen polling interval right after a waiter registers or the screen changes
+SCREEN_POLL_INTERVAL = 0.05
+# Growth factor applied to the interval while the screen stays unchanged
+SCREEN_POLL_BACKOFF = 1.5
+# Upper bound the polling interval backs off to
+SCREEN_POLL_MAX_INTERVAL = 0.5
+
+# Ascii() output is reused for this long unless input was sent since
+SCREEN_CACHE_TTL = 0.1
+
+# Connect waits up to this long for the host's initial screen
+CONNECT_SCREEN_TIMEOUT = 2.0
+# Wait after each connect-time key press for the host to respond
+CONNECT_SETTLE_TIMEOUT = 1.0
+# Granularity of the connect-time polls
+CONNECT_POLL_INTERVAL = 0.1
+
+# Pooled script sessions idle longer than this are disconnected
+SESSION_IDLE_TIMEOUT = 300.0
+# How often idle pooled sessions are checked for eviction
+SESSION_EVICT_INTERVAL = 60.0
+
+# Fields of the tnz status line, e.g. 'L U U N N ? 24 80 0 0 0x00 -'
+_STATUS_ROWS_IDX = 6
+_STATUS_COLS_IDX = 7
+_STATUS_CURSOR_ROW_IDX = 8
+_STATUS_CURSOR_COL_IDX = 9
+
+# Lowercased key name -> (Emulator method, args) for send_key
+_KEY_MAP: dict[str, tuple[str, tuple]] = {
+    "enter": ("Enter", ()),
+    "clear": ("Clear", ()),
+    "tab": ("Tab", ()),
+    "backtab": ("BackTab", ()),
+    **{f"pf{n}": ("PF", (n,)) for n in range(1, 25)},
+    **{f"pa{n}": ("PA", (n,)) for n in range(1, 4)},
+}
+
+
+def _sleeper(timeout: float, interval: float):
+    """Yield the time left until timeout, at most once per interval"""
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        step_start = time.monotonic()
+        yield remaining
+        elapsed = time.monotonic() - step_start
+        if elapsed < interval:
+            time.sleep(min(interval - elapsed, max(deadline - time.monotonic(), 0)))
+
+
+def _screen_rows(screen_lines) -> list[str]:
+    """Screen rows from Ascii() output, dropping 'data: ' prefixes and status lines"""
+    if not isinstance(screen_lines, list):
+        return str(screen_lines).split('\n')
+
+    # Plain rows need no per-line filtering
+    if not screen_lines or not screen_lines[0].startswith('data: '):
+        return screen_lines
+
+    # Prefixed rows are followed by the status line and 'ok'/'error'
+    if screen_lines[-1] in ('ok', 'error'):
+        screen_lines = screen_lines[:-2]
+    return [line[6:] for line in screen_lines]
+
+
+def _screen_lines_to_text(screen_lines) -> str:
+    """Join Ascii() output into screen text"""
+    return '\n'.join(_screen_rows(screen_lines))
+
 
 class TerminalSession:
     """Represents a single 3270 terminal session"""
@@ -14,261 +92,393 @@ class TerminalSession:
         self.host = host
         self.port = port
         self.use_tls = use_tls
+        # Connect() target, with the L: prefix tnz uses for TLS
+        self._host_string = f"{'L:' if use_tls else ''}{host}:{port}"
         self.connection: Optional[Emulator] = None
+        # connection.Query, bound once per Emulator
+        self._query: Optional[Callable[..., list[str]]] = None
         self.is_connected = False
+        self._screen_waiters: list[tuple[bytes, asyncio.Future]] = []
+        # Hash of the last polled screen and how many waiters were checked against it
+        self._last_screen_hash = 0
+        self._screen_checked = 0
+        self._watch_task: Optional[asyncio.Task] = None
+        # Set when a waiter registers so the idle watcher resumes polling
+        self._waiter_added = asyncio.Event()
+        # The Emulator is not thread-safe, so every call goes through one worker
+        self._executor: Optional[ThreadPoolExecutor] = self._new_executor()
+        # Last Ascii() output, stale once input is sent or SCREEN_CACHE_TTL passes
+        self._screen_cache: Optional[list[str]] = None
+        self._screen_cache_time = 0.0
+        self._screen_dirty = True
+        # send_key name -> Emulator call bound to the current connection
+        self._key_bindings: dict[str, Callable[[], object]] = {}
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        """Create the single-worker executor that owns this session's Emulator"""
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"tnz-{self.session_id[:8]}")
 
     async def connect(self):
         """Connect to the 3270 host"""
         try:
             # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
+            if self._executor is None:
+                self._executor = self._new_executor()
+            loop = asyncio.get_running_loop()
             await loop.run_in_executor(
-                None,
+                self._executor,
                 self._sync_connect
             )
             self.is_connected = True
+            self._watch_task = asyncio.create_task(self._watch_screen())
             return True
         except Exception as e:
             raise Exception(f"Failed to connect to {self.host}:{self.port} - {str(e)}")
 
     def _sync_connect(self):
         """Synchronous connection (runs in executor)"""
-        import sys
-        import time
         # Try with specific terminal model (common 3270 models)
         self.connection = Emulator(visible=False)
+        self._query = self.connection.Query
+        self._key_bindings.clear()
 
         # Set common 3270 terminal characteristics
         try:
             # Many systems expect IBM-3278-2 or similar
-            print(f"[DEBUG] Setting up emulator options", file=sys.stderr)
+            logger.debug("Setting up emulator options")
         except Exception as e:
-            print(f"[DEBUG] Emulator setup failed: {e}", file=sys.stderr)
+            logger.debug("Emulator setup failed: %s", e)
         # Build connection string with TLS if needed
-        protocol = "L:" if self.use_tls else ""
-        host_string = f"{protocol}{self.host}:{self.port}"
-        print(f"[DEBUG] Connecting to: {host_string}", file=sys.stderr)
-        self.connection.Connect(host_string)
+        logger.debug("Connecting to: %s", self._host_string)
+        self.connection.Connect(self._host_string)
 
         # Wait for connection to be fully established
-        print(f"[DEBUG] Waiting for connection to stabilize...", file=sys.stderr)
-        time.sleep(2)  # Give time for initial screen
+        logger.debug("Waiting for connection to stabilize...")
+        # Poll for the initial screen instead of sleeping a fixed time
+        got_screen = self._wait_for_screen(CONNECT_SCREEN_TIMEOUT)
 
-        # Try different methods to get initial screen
-        try:
-            # Method 1: Wait for any output
-            print(f"[DEBUG] Trying Wait('Output')", file=sys.stderr)
-            self.connection.Wait('Output', timeout=5)
-        except Exception as e:
-            print(f"[DEBUG] Wait Output failed: {e}", file=sys.stderr)
+        if not got_screen:
             try:
-                # Method 2: Send Enter to wake up the system
-                print(f"[DEBUG] Sending Enter to wake up system", file=sys.stderr)
-                self.connection.Enter()
-                time.sleep(1)
+                # Send Enter to wake up the system
+                logger.debug("Sending Enter to wake up system")
+                self._press_and_wait(self.connection.Enter, CONNECT_SETTLE_TIMEOUT)
             except Exception as e2:
-                print(f"[DEBUG] Enter failed: {e2}", file=sys.stderr)
+                logger.debug("Enter failed: %s", e2)
 
         # Try to trigger initial screen
         try:
             # Some systems need a key press to show login screen
-            print(f"[DEBUG] Sending PF1 to trigger screen", file=sys.stderr)
-            self.connection.PF(1)
-            time.sleep(1)
+            logger.debug("Sending PF1 to trigger screen")
+            self._press_and_wait(functools.partial(self.connection.PF, 1), CONNECT_SETTLE_TIMEOUT)
         except Exception as e:
-            print(f"[DEBUG] PF1 failed: {e}", file=sys.stderr)
+            logger.debug("PF1 failed: %s", e)
 
         # Check emulator status
         try:
-            status = self.connection.Query()
-            print(f"[DEBUG] Emulator status after setup: {status}", file=sys.stderr)
-
-            # Try to get current screen
-            screen_lines = self.connection.Ascii()
-            if isinstance(screen_lines, list) and len(screen_lines) > 0:
-                print(f"[DEBUG] Initial screen has {len(screen_lines)} lines", file=sys.stderr)
-                print(f"[DEBUG] First line after setup: {screen_lines[0]!r}", file=sys.stderr)
-
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Emulator status after setup: %s", self.connection.Query())
+
+                # Try to get current screen
+                screen_lines = self.connection.Ascii()
+                if isinstance(screen_lines, list) and len(screen_lines) > 0:
+                    logger.debug("Initial screen has %d lines", len(screen_lines))
+                    logger.debug("First line after setup: %r", screen_lines[0])
         except Exception as e:
-            print(f"[DEBUG] Status check failed: {e}", file=sys.stderr)
-
-        print(f"[DEBUG] Connection setup complete", file=sys.stderr)
+            logger.debug("Status check failed: %s", e)
+
+        logger.debug("Connection setup complete")
+        self._screen_dirty = True
+
+    def _screen_has_content(self) -> bool:
+        """Whether the host has painted anything on the screen yet"""
+        screen_lines = self.connection.Ascii()
+        return any(
+            line.startswith('data: ') and line[6:].strip()
+            for line in screen_lines
+            if isinstance(line, str)
+        )
+
+    def _wait_for_screen(self, timeout: float) -> bool:
+        """Poll until the screen has content or timeout expires"""
+        for remaining in _sleeper(timeout, CONNECT_POLL_INTERVAL):
+            if self._screen_has_content():
+                return True
+            # Returns as soon as host output arrives, else after the interval
+            self.connection.Wait(min(remaining, CONNECT_POLL_INTERVAL), Output)
+        return self._screen_has_content()
+
+    def _press_and_wait(self, press: Callable[[], object], timeout: float) -> bool:
+        """Press a key, then poll until the screen changes or timeout expires"""
+        before = _screen_rows(self.connection.Ascii())
+        press()
+        for remaining in _sleeper(timeout, CONNECT_POLL_INTERVAL):
+            # Wait() returns early on host output but reports "ok" on timeout too,
+            # so compare the screen to tell whether the host answered
+            self.connection.Wait(min(remaining, CONNECT_POLL_INTERVAL), Output)
+            if _screen_rows(self.connection.Ascii()) != before:
+                return True
+        return False
 
     async def disconnect(self):
         """Disconnect from the host"""
+        if self._watch_task:
+            self._watch_task.cancel()
+            self._watch_task = None
+        for _, fut in self._screen_waiters:
+            if not fut.done():
+                fut.set_result(False)
+        self._screen_waiters = []
+        self._screen_checked = 0
+
         if self.connection:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.connection.Disconnect)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, self.connection.Disconnect)
             self.is_connected = False
 
+        self._shutdown_executor()
+
+    def _shutdown_executor(self):
+        """Release the session's worker thread"""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _watch_screen(self):
+        """Poll the screen and resolve wait_for_text waiters whose text appears"""
+        loop = asyncio.get_running_loop()
+        interval = SCREEN_POLL_INTERVAL
+
+        while self.is_connected:
+            if not self._screen_waiters:
+                # Nobody is waiting, sleep until a waiter registers
+                self._waiter_added.clear()
+                await self._waiter_added.wait()
+                interval = SCREEN_POLL_INTERVAL
+                continue
+
+            try:
+                screen_lines = await loop.run_in_executor(self._executor, self._ascii)
+            except Exception:
+                screen_lines = None
+
+            if screen_lines is not None:
+                # Ascii() escapes non-ASCII characters, so the screen is plain ASCII
+                buf = _screen_lines_to_text(screen_lines).encode("ascii", "backslashreplace")
+                screen_hash = hash(buf)
+                # An unchanged screen only needs checking for newly registered waiters
+                changed = screen_hash != self._last_screen_hash
+                start = 0 if changed else self._screen_checked
+                self._last_screen_hash = screen_hash
+
+                pending = []
+                for i, (needle, fut) in enumerate(self._screen_waiters):
+                    if fut.done():
+                        continue
+                    if i >= start and buf.find(needle) >= 0:
+                        fut.set_result(True)
+                    else:
+                        pending.append((needle, fut))
+                self._screen_waiters = pending
+                self._screen_checked = len(pending)
+
+                # Poll quickly while the host is painting, back off while it is quiet
+                if changed:
+                    interval = SCREEN_POLL_INTERVAL
+                else:
+                    interval = min(interval * SCREEN_POLL_BACKOFF, SCREEN_POLL_MAX_INTERVAL)
+
+            await asyncio.sleep(interval)
+
     async def send_text(self, text: str, row: Optional[int] = None, col: Optional[int] = None):
         """Send text to the terminal"""
         if not self.connection:
             raise Exception("Not connected")
 
-        loop = asyncio.get_event_loop()
-
-        def _send():
-            if row is not None and col is not None:
-                # Move cursor then send text (rows/cols are 0-indexed in API, 1-indexed in emulator)
-                self.connection.MoveCursor(row + 1, col + 1)
-            self.connection.String(text)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._sync_send_text, text, row, col)
 
-        await loop.run_in_executor(None, _send)
+    def _sync_send_text(self, text: str, row: Optional[int], col: Optional[int]):
+        """Type text, optionally at a position (runs in executor)"""
+        if row is not None and col is not None:
+            # Move cursor then send text (rows/cols are 0-indexed in API, 1-indexed in emulator)
+            self.connection.MoveCursor(row + 1, col + 1)
+        self.connection.String(text)
+        self._screen_dirty = True
 
     async def send_key(self, key: str):
         """Send a special key (Enter, PF1, etc)"""
         if not self.connection:
             raise Exception("Not connected")
 
-        loop = asyncio.get_event_loop()
-
-        def _send():
-            key_lower = key.lower()
-            # Handle Enter
-            if key_lower == "enter":
-                self.connection.Enter()
-            # Handle PF keys
-            elif key_lower.startswith("pf"):
-                num = int(key_lower[2:])
-                self.connection.PF(num)
-            # Handle PA keys
-            elif key_lower.startswith("pa"):
-                num = int(key_lower[2:])
-                self.connection.PA(num)
-            # Handle Clear
-            elif key_lower == "clear":
-                self.connection.Clear()
-            # Handle Tab
-            elif key_lower == "tab":
-                self.connection.Tab()
-            # Handle BackTab
-            elif key_lower == "backtab":
-                self.connection.BackTab()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._sync_send_key, key)
+
+    def _sync_send_key(self, key: str):
+        """Press a special key (runs in executor)"""
+        press = self._key_bindings.get(key)
+        if press is None:
+            mapped = _KEY_MAP.get(key.lower())
+            if mapped is None:
+                # Fallback to Key method; arbitrary names are not cached
+                press = functools.partial(self.connection.Key, key)
             else:
-                # Fallback to Key method
-                self.connection.Key(key)
-
-        await loop.run_in_executor(None, _send)
+                method, args = mapped
+                press = self._key_bindings[key] = functools.partial(getattr(self.connection, method), *args)
+        press()
+        self._screen_dirty = True
+
+    def _fresh_screen_cache(self) -> Optional[list[str]]:
+        """Cached Ascii() output if it is still current, else None"""
+        if self._screen_dirty or time.monotonic() - self._screen_cache_time > SCREEN_CACHE_TTL:
+            return None
+        return self._screen_cache
+
+    def _ascii(self) -> list[str]:
+        """Ascii() output, reusing the cached screen while it is current (runs in executor)"""
+        screen_lines = self._fresh_screen_cache()
+        if screen_lines is None:
+            self._screen_dirty = False
+            screen_lines = self._screen_cache = self.connection.Ascii()
+            self._screen_cache_time = time.monotonic()
+        return screen_lines
 
     async def move_cursor(self, row: int, col: int):
         """Move cursor to position"""
         if not self.connection:
             raise Exception("Not connected")
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._sync_move_cursor, row, col)
+
+    def _sync_move_cursor(self, row: int, col: int):
+        """Move the cursor (runs in executor)"""
         # Convert 0-indexed to 1-indexed
-        await loop.run_in_executor(None, self.connection.MoveCursor, row + 1, col + 1)
+        self.connection.MoveCursor(row + 1, col + 1)
+        self._screen_dirty = True
 
     async def get_screen_data(self) -> ScreenData:
         """Get current screen data"""
         if not self.connection:
             raise Exception("Not connected")
 
-        loop = asyncio.get_event_loop()
-
-        def _get_data():
-            # Query screen status to get dimensions and cursor position
-            # Format: 'L U U N N ? 24 80 0 0 0x00 -'
-            # Positions: ... rows cols cursor_row cursor_col ...
-            status = self.connection.Query('Cursor')
-            status_line = status[1] if len(status) > 1 else ""
-            parts = status_line.split()
-
-            # Default values
-            rows = 24
-            cols = 80
-            cursor_row = 0
-            cursor_col = 0
-
-            if len(parts) >= 10:
-                try:
-                    rows = int(parts[6])
-                    cols = int(parts[7])
-                    cursor_row = int(parts[8])
-                    cursor_col = int(parts[9])
-                except (ValueError, IndexError):
-                    pass
-
-            # Get full screen text using Ascii
-            # Ascii() returns list like: ['data: line1', 'data: line2', ...]
-            # We need to strip the 'data: ' prefix
-            screen_lines = self.connection.Ascii()
-
-            import sys
-            print(f"[DEBUG] Ascii() returned type: {type(screen_lines)}", file=sys.stderr)
-            if isinstance(screen_lines, list):
-                print(f"[DEBUG] Number of lines: {len(screen_lines)}", file=sys.stderr)
-                if len(screen_lines) > 0:
-                    print(f"[DEBUG] First line: {screen_lines[0]!r}", file=sys.stderr)
-                    if len(screen_lines) > 12:
-                        print(f"[DEBUG] Middle line (12): {screen_lines[12]!r}", file=sys.stderr)
-                    print(f"[DEBUG] Last line: {screen_lines[-1]!r}", file=sys.stderr)
-
-            if isinstance(screen_lines, list):
-                # Strip 'data: ' prefix if present and filter status lines
-                cleaned_lines = []
-                for line in screen_lines:
-                    if isinstance(line, str):
-                        if line.startswith('data: '):
-                            cleaned_lines.append(line[6:])  # Remove 'data: ' prefix
-                        elif not line.startswith(('ok', 'error')):
-                            cleaned_lines.append(line)
-                text = '\n'.join(cleaned_lines)
-                print(f"[DEBUG] Cleaned text length: {len(text)}, lines: {len(cleaned_lines)}", file=sys.stderr)
-            else:
-                text = str(screen_lines)
-                print(f"[DEBUG] Screen text (as string): {text[:100]}", file=sys.stderr)
-
-            # Get field information
-            fields = []
-
-            return ScreenData(
-                session_id=self.session_id,
-                rows=rows,
-                cols=cols,
-                cursor_row=cursor_row,
-                cursor_col=cursor_col,
-                text=text,
-                fields=fields
-            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._sync_screen_data)
+
+    async def send_and_read(
+        self,
+        text: Optional[str] = None,
+        key: Optional[str] = None,
+        row: Optional[int] = None,
+        col: Optional[int] = None
+    ) -> ScreenData:
+        """Move the cursor, type text and press a key, then read the screen in one executor call"""
+        if not self.connection:
+            raise Exception("Not connected")
 
-        return await loop.run_in_executor(None, _get_data)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._sync_send_and_read, text, key, row, col)
+
+    def _sync_send_and_read(
+        self,
+        text: Optional[str],
+        key: Optional[str],
+        row: Optional[int],
+        col: Optional[int]
+    ) -> ScreenData:
+        """Apply input and read the screen (runs in executor)"""
+        if row is not None and col is not None:
+            self.connection.MoveCursor(row + 1, col + 1)
+        if text:
+            self.connection.String(text)
+        if key:
+            self._sync_send_key(key)
+        self._screen_dirty = True
+        return self._sync_screen_data()
+
+    def _sync_screen_data(self) -> ScreenData:
+        """Read screen dimensions, cursor and text (runs in executor)"""
+        # Query screen status to get dimensions and cursor position
+        # Format: 'L U U N N ? 24 80 0 0 0x00 -', see the _STATUS_*_IDX constants
+        status = self._query('Cursor')
+        status_line = status[1] if len(status) > 1 else ""
+        parts = status_line.split()
+
+        # Default values
+        rows = 24
+        cols = 80
+        cursor_row = 0
+        cursor_col = 0
+
+        if len(parts) > _STATUS_CURSOR_COL_IDX:
+            try:
+                rows = int(parts[_STATUS_ROWS_IDX])
+                cols = int(parts[_STATUS_COLS_IDX])
+                cursor_row = int(parts[_STATUS_CURSOR_ROW_IDX])
+                cursor_col = int(parts[_STATUS_CURSOR_COL_IDX])
+            except ValueError:
+                pass
+
+        # Get full screen text using Ascii
+        # Ascii() returns list like: ['data: line1', 'data: line2', ...]
+        # We need to strip the 'data: ' prefix
+        screen_lines = self._ascii()
+
+        # Strip 'data: ' prefix if present and filter status lines
+        lines = _screen_rows(screen_lines)
+        text = '\n'.join(lines)
+        logger.debug("Ascii() returned %d lines, %d chars of text", len(screen_lines), len(text))
+
+        # Values come straight from the emulator, skip validation
+        return ScreenData.model_construct(
+            session_id=self.session_id,
+            rows=rows,
+            cols=cols,
+            cursor_row=cursor_row,
+            cursor_col=cursor_col,
+            text=text,
+            fields=[],
+            lines=lines
+        )
 
     async def read_text(self, row: int, col: int, length: int) -> str:
         """Read text at specific position"""
         if not self.connection:
             raise Exception("Not connected")
 
-        loop = asyncio.get_event_loop()
-
-        def _read():
-            # Use Ascii to get screen content and extract the text
-            screen_lines = self.connection.Ascii()
-            if isinstance(screen_lines, list) and 0 <= row < len(screen_lines):
-                line = screen_lines[row]
-                return line[col:col+length] if col < len(line) else ""
-            return ""
+        # Repeated reads of the same screen skip the executor entirely
+        screen_lines = self._fresh_screen_cache()
+        if screen_lines is None:
+            loop = asyncio.get_running_loop()
+            screen_lines = await loop.run_in_executor(self._executor, self._ascii)
 
-        return await loop.run_in_executor(None, _read)
+        if isinstance(screen_lines, list) and 0 <= row < len(screen_lines):
+            line = screen_lines[row]
+            if line.startswith('data: '):
+                line = line[6:]
+            return line[col:col+length] if col < len(line) else ""
+        return ""
 
     async def wait_for_text(self, text: str, timeout: float = 10.0) -> bool:
         """Wait for specific text to appear on screen"""
         if not self.connection:
             raise Exception("Not connected")
 
-        loop = asyncio.get_event_loop()
+        # Register a waiter resolved by the screen watcher task
+        # Match the backslash escapes Ascii() uses for non-ASCII characters
+        needle = text.encode("ascii", "backslashreplace")
 
-        def _wait():
-            try:
-                # Use Emulator's Expect method if available
-                self.connection.Expect(text, timeout=int(timeout))
-                return True
-            except:
-                # If Expect fails or times out, return False
-                return False
+        # A screen read moments ago may already show the text
+        screen_lines = self._fresh_screen_cache()
+        if screen_lines is not None and needle in _screen_lines_to_text(screen_lines).encode("ascii", "backslashreplace"):
+            return True
 
-        return await loop.run_in_executor(None, _wait)
+        fut = asyncio.get_running_loop().create_future()
+        self._screen_waiters.append((needle, fut))
+        self._waiter_added.set()
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            return False
 
 
 class TerminalManager:
@@ -276,10 +486,13 @@ class TerminalManager:
 
     def __init__(self):
         self.sessions: dict[str, TerminalSession] = {}
+        # Connected sessions released by script runs, keyed by (pool, host, port, use_tls)
+        self._idle: dict[tuple[str, str, int, bool], list[tuple[float, TerminalSession]]] = {}
+        self._evict_task: Optional[asyncio.Task] = None
 
     def create_session(self, host: str, port: int, use_tls: bool = True) -> str:
         """Create a new terminal session"""
-        session_id = str(uuid.uuid4())
+        session_id = secrets.token_hex(16)
         session = TerminalSession(session_id, host, port, use_tls)
         self.sessions[session_id] = session
         return session_id
@@ -294,7 +507,63 @@ class TerminalManager:
         if session:
             if session.is_connected:
                 await session.disconnect()
-            del self.sessions[session_id]
+            else:
+                session._shutdown_executor()
+            self.sessions.pop(session_id, None)
+
+    async def acquire(
+        self,
+        host: str,
+        port: int,
+        use_tls: bool = True,
+        pool: Optional[str] = None
+    ) -> tuple[TerminalSession, bool]:
+        """Get a connected session for a host and whether it was reused
+
+        With a pool name, an idle session released to that pool is reused;
+        it is still on whatever screen its previous user left it on.
+        """
+        idle = self._idle.get((pool, host, port, use_tls)) if pool is not None else None
+        while idle:
+            _, session = idle.pop()
+            # Skip sessions removed or disconnected while they sat in the pool
+            if session.is_connected and session.session_id in self.sessions:
+                return session, True
+
+        session_id = self.create_session(host, port, use_tls)
+        session = self.sessions[session_id]
+        try:
+            await session.connect()
+        except Exception:
+            await self.remove_session(session_id)
+            raise
+        return session, False
+
+    async def release(self, session: TerminalSession, pool: str):
+        """Return a session from acquire() to a named idle pool"""
+        if not session.is_connected:
+            await self.remove_session(session.session_id)
+            return
+
+        key = (pool, session.host, session.port, session.use_tls)
+        self._idle.setdefault(key, []).append((time.monotonic(), session))
+        if self._evict_task is None or self._evict_task.done():
+            self._evict_task = asyncio.create_task(self._evict_idle())
+
+    async def _evict_idle(self):
+        """Disconnect pooled sessions that have been idle too long"""
+        while self._idle:
+            await asyncio.sleep(SESSION_EVICT_INTERVAL)
+            cutoff = time.monotonic() - SESSION_IDLE_TIMEOUT
+            expired = []
+            for key, idle in list(self._idle.items()):
+                expired.extend(session for last_used, session in idle if last_used < cutoff)
+                idle[:] = [entry for entry in idle if entry[0] >= cutoff]
+                if not idle:
+                    del self._idle[key]
+
+            for session in expired:
+                await self.remove_session(session.session_id)
 
     def list_sessions(self) -> list[dict]:
         """List all active sessions"""
@@ -8,7 +8,9 @@ def main():
         "app.main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.debug
+        reload=settings.debug,
+        loop=settings.loop,
+        http=settings.http
     )
 
 
@@ -3,7 +3,7 @@ import { Terminal } from '@xterm/xterm';
 import { FitAddon } from '@xterm/addon-fit';
 import { WebLinksAddon } from '@xterm/addon-web-links';
 import '@xterm/xterm/css/xterm.css';
-import type { ScreenData } from '../types/automation';
+import type { ScreenData, ScreenDiff } from '../types/automation';
 
 interface TerminalEmulatorProps {
   sessionId: string;
@@ -100,6 +100,8 @@ export function TerminalEmulator({ sessionId, onCellClick, recordMode = false }:
         const data = JSON.parse(event.data);
         if (data.type === 'screen_update') {
           updateScreen(data.data as ScreenData);
+        } else if (data.type === 'screen_diff') {
+          applyScreenDiff(data.data as ScreenDiff);
         }
       };
 
@@ -176,6 +178,20 @@ export function TerminalEmulator({ sessionId, onCellClick, recordMode = false }:
     terminal.write(`\x1b[${screenData.cursor_row + 1};${screenData.cursor_col + 1}H`);
   };
 
+  const applyScreenDiff = (diff: ScreenDiff) => {
+    const terminal = xtermRef.current;
+    if (!terminal) return;
+
+    // Rewrite only the rows that changed since the last frame
+    diff.rows.forEach(({ r, t }) => {
+      terminal.write(`\x1b[${r + 1};1H\x1b[2K`);
+      terminal.write(t.replace(/\0/g, ' '));
+    });
+
+    // Move cursor to correct position
+    terminal.write(`\x1b[${diff.cursor_row + 1};${diff.cursor_col + 1}H`);
+  };
+
   const handleTerminalClick = (e: React.MouseEvent<HTMLDivElement>) => {
     if (!onCellClick || !xtermRef.current) return;
 
@@ -32,6 +32,7 @@ export interface AutomationScript {
   port: number;
   use_tls: boolean;
   steps: AutomationStep[];
+  reuse_session?: boolean;
   created_at?: string;
   updated_at?: string;
 }
@@ -61,6 +62,12 @@ export interface ScreenData {
   fields?: Array<Record<string, any>>;
 }
 
+export interface ScreenDiff {
+  cursor_row: number;
+  cursor_col: number;
+  rows: Array<{ r: number; t: string }>;
+}
+
 export interface ExecutionLog {
   step_id: string;
   status: 'success' | 'error' | 'running';